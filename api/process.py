@@ -1,3 +1,4 @@
+import base64
 import json
 import sys
 from http.server import BaseHTTPRequestHandler
@@ -9,11 +10,28 @@ ROOT = Path(__file__).resolve().parent.parent
 if str(ROOT) not in sys.path:
     sys.path.append(str(ROOT))
 
-from codec import run_full_pipeline
+from codec import pack_bits, run_full_pipeline_cached
+
+try:  # Optional: orjson serializes the large bit fields several times faster
+    import orjson
+except ImportError:  # pragma: no cover - stdlib fallback
+    orjson = None
+
+
+def _dumps(payload: Dict[str, Any]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+
+def _loads(raw_body: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw_body)
+    return json.loads(raw_body)
 
 
 def _json_response(handler: BaseHTTPRequestHandler, status: int, payload: Dict[str, Any]) -> None:
-    body = json.dumps(payload).encode("utf-8")
+    body = _dumps(payload)
     handler.send_response(status)
     handler.send_header("Content-Type", "application/json")
     handler.send_header("Content-Length", str(len(body)))
@@ -26,7 +44,14 @@ def _preview(text: str, limit: int) -> str:
     return text[:limit] if text else ""
 
 
-def _validate_request(data: Dict[str, Any]) -> Tuple[str, int]:
+def _packed(bits: str) -> Dict[str, Any]:
+    return {
+        "bit_length": len(bits),
+        "data": base64.b64encode(pack_bits(bits)).decode("ascii"),
+    }
+
+
+def _validate_request(data: Dict[str, Any]) -> Tuple[str, int, bool]:
     if not isinstance(data, dict):
         raise ValueError("Request body must be a JSON object")
 
@@ -42,10 +67,16 @@ def _validate_request(data: Dict[str, Any]) -> Tuple[str, int]:
     if interval < 1:
         raise ValueError("'error_interval' must be >= 1")
 
-    return text, interval
+    include_full = data.get("include_full_outputs", False)
+    if not isinstance(include_full, bool):
+        raise ValueError("'include_full_outputs' must be a boolean")
+
+    return text, interval, include_full
 
 
-def _build_response(text: str, interval: int, results: Dict[str, Any]) -> Dict[str, Any]:
+def _build_response(
+    text: str, interval: int, results: Dict[str, Any], include_full: bool = False
+) -> Dict[str, Any]:
     encoded_bits = results.get("encoded_bits", "")
     hamming_bits = results.get("hamming_bits", "")
     corrupted_bits = results.get("corrupted_bits", "")
@@ -59,7 +90,7 @@ def _build_response(text: str, interval: int, results: Dict[str, Any]) -> Dict[s
 
     top_probs = sorted(results.get("probabilities", {}).items(), key=lambda kv: -kv[1])[:10]
 
-    return {
+    response = {
         "success": True,
         "summary": {
             "original_length": len(text),
@@ -83,18 +114,25 @@ def _build_response(text: str, interval: int, results: Dict[str, Any]) -> Dict[s
         "decoded_text_preview": _preview(results.get("decoded_text", ""), 300),
         "corrupted_decoded_preview": _preview(results.get("corrupted_decoded_text", ""), 300),
         "recovered_decoded_preview": _preview(results.get("recovered_decoded_text", ""), 300),
-        # Full outputs to support downloads on the client
-        "encoded_bits": encoded_bits,
-        "hamming_bits": hamming_bits,
-        "corrupted_bits": corrupted_bits,
-        "recovered_bits": recovered_bits,
-        "corrupted_decoded_text": results.get("corrupted_decoded_text", ""),
-        "recovered_decoded_text": results.get("recovered_decoded_text", ""),
         "codes": results.get("codes", {}),
         "probabilities": results.get("probabilities", {}),
         "error_interval": interval,
     }
 
+    # Full outputs only on request: they dwarf the previews the UI renders
+    if include_full:
+        response.update({
+            # Packed 8 bits per byte to keep downloads small
+            "encoded_bits": _packed(encoded_bits),
+            "hamming_bits": _packed(hamming_bits),
+            "corrupted_bits": _packed(corrupted_bits),
+            "recovered_bits": _packed(recovered_bits),
+            "corrupted_decoded_text": results.get("corrupted_decoded_text", ""),
+            "recovered_decoded_text": results.get("recovered_decoded_text", ""),
+        })
+
+    return response
+
 
 class handler(BaseHTTPRequestHandler):
     def do_OPTIONS(self) -> None:  # pragma: no cover - HTTP negotiation
@@ -109,19 +147,19 @@ class handler(BaseHTTPRequestHandler):
             content_length = int(self.headers.get("Content-Length", 0))
             raw_body = self.rfile.read(content_length) if content_length else b""
             try:
-                data = json.loads(raw_body.decode("utf-8")) if raw_body else {}
+                data = _loads(raw_body) if raw_body else {}
             except json.JSONDecodeError as exc:
                 _json_response(self, 400, {"error": f"Invalid JSON: {exc}"})
                 return
 
             try:
-                text, interval = _validate_request(data)
+                text, interval, include_full = _validate_request(data)
             except ValueError as exc:
                 _json_response(self, 400, {"error": str(exc)})
                 return
 
-            pipeline_results = run_full_pipeline(text, error_interval=interval)
-            response_body = _build_response(text, interval, pipeline_results)
+            pipeline_results = run_full_pipeline_cached(text, error_interval=interval)
+            response_body = _build_response(text, interval, pipeline_results, include_full)
             _json_response(self, 200, response_body)
         except Exception as exc:  # pragma: no cover - runtime guard
             _json_response(self, 500, {"error": f"Processing failed: {exc}"})
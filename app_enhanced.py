@@ -1,20 +1,74 @@
 # Enhanced Flask Application for Information Theory Project
 # Integrates with modern web interface and provides API endpoints
 
-from flask import Flask, request, jsonify, send_from_directory, render_template_string
+from flask import Flask, request, jsonify, send_file, send_from_directory, render_template_string
 from flask_cors import CORS
+from werkzeug.security import safe_join
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
+import io
 import json
 import os
+import threading
+import time
+import uuid
+import zipfile
 
-from codec import run_full_pipeline
+from codec import enable_worker_pool, run_full_pipeline_cached
+
+try:  # Optional: gzip responses, JSON payloads are mostly '0'/'1' text
+    from flask_compress import Compress
+except ImportError:
+    Compress = None
+
+try:  # Optional: orjson serializes the large pipeline payloads several times faster
+    import orjson
+    from flask.json.provider import DefaultJSONProvider
+except ImportError:
+    orjson = None
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for modern frontend integration
+if Compress is not None:
+    Compress(app)
+
+if orjson is not None:
+    class ORJSONProvider(DefaultJSONProvider):
+        """Route jsonify() and request.get_json() through orjson"""
+
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(obj, default=self.default).decode("utf-8")
+
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+
+    app.json = ORJSONProvider(app)
 
 RUNS_DIR = Path("runs")
 UPLOAD_DIR = Path("uploads")
+ARTIFACTS_ARCHIVE = "artifacts.zip"
+
+# Writes each run's ARTIFACTS_ARCHIVE off the request thread. Runs still being
+# written map their run_id to the job's future so readers can wait on it.
+ARCHIVE_EXECUTOR = ThreadPoolExecutor(max_workers=1)
+PENDING_ARCHIVES = {}
+PENDING_ARCHIVES_LOCK = threading.Lock()
+
+# Full-size run artifacts served by /api/runs/<run_id>/<field>
+RUN_ARTIFACTS = {
+    'text': 'Text.txt',
+    'huffman_codes': 'huffman_codes.txt',
+    'encoded_bits': 'part2_bits.txt',
+    'decoded_text': 'part3_decoded.txt',
+    'hamming_bits': 'part4_hamming_bits.txt',
+    'corrupted_bits': 'part5_corrupted_bits.txt',
+    'corrupted_data_bits': 'part5b_corrupted_data_bits.txt',
+    'corrupted_decoded_text': 'part5c_corrupted_decoded_text.txt',
+    'recovered_bits': 'part6_recovered_bits.txt',
+    'recovered_decoded_text': 'part6_recovered_decoded_text.txt',
+}
 
 # Ensure directories exist
 RUNS_DIR.mkdir(exist_ok=True)
@@ -79,7 +133,7 @@ def process_text():
             return jsonify({'error': 'No text provided'}), 400
         
         # Run the complete pipeline
-        results = run_full_pipeline(text, error_interval=error_interval)
+        results = run_full_pipeline_cached(text, error_interval=error_interval)
         
         # Create run directory and save outputs
         run_dir = make_run_dir()
@@ -89,6 +143,10 @@ def process_text():
         response_data = {
             'success': True,
             'run_directory': str(run_dir),
+            'run_id': run_dir.name,
+            'downloads': {
+                field: f'/api/runs/{run_dir.name}/{field}' for field in RUN_ARTIFACTS
+            },
             'summary': {
                 'original_length': results['text_length'],
                 'encoded_length': len(results['encoded_bits']),
@@ -148,11 +206,11 @@ def list_runs():
                         summary = json.load(f)
                     runs.append({
                         'directory': run_dir.name,
-                        'timestamp': run_dir.name,
+                        'timestamp': run_dir.name[:19],  # drop the uniqueness suffix
                         'summary': summary
                     })
     
-    return jsonify({'runs': sorted(runs, key=lambda x: x['timestamp'], reverse=True)})
+    return jsonify({'runs': sorted(runs, key=lambda x: x['directory'], reverse=True)})
 
 @app.route('/api/runs/<run_id>', methods=['GET'])
 def get_run(run_id):
@@ -180,58 +238,147 @@ def get_run(run_id):
             'recovered_bits': 'part6_recovered_bits.txt'
         }
         
-        for key, filename in files_to_load.items():
-            file_path = run_dir / filename
-            if file_path.exists():
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    result[key] = content[:1000] + '...' if len(content) > 1000 else content
+        with run_artifacts(run_dir) as open_artifact:
+            for key, filename in files_to_load.items():
+                stream = open_artifact(filename)
+                if stream is None:
+                    continue
+                # Only the preview is read, not the whole artifact
+                with io.TextIOWrapper(stream, encoding='utf-8') as f:
+                    content = f.read(1001)
+                result[key] = content[:1000] + '...' if len(content) > 1000 else content
         
         return jsonify(result)
         
     except Exception as e:
         return jsonify({'error': f'Failed to load run data: {str(e)}'}), 500
 
-# Original helper functions (unchanged)
+@app.route('/api/runs/<run_id>/<field>', methods=['GET'])
+def download_run_artifact(run_id, field):
+    """Download one full-size artifact of a run"""
+    filename = RUN_ARTIFACTS.get(field)
+    if filename is None:
+        return jsonify({'error': f'Unknown artifact: {field}'}), 404
+    # safe_join rejects run_ids that would escape RUNS_DIR
+    run_path = safe_join(str(RUNS_DIR), run_id)
+    stream = None
+    if run_path:
+        with run_artifacts(Path(run_path)) as open_artifact:
+            stream = open_artifact(filename)
+    if stream is None:
+        return jsonify({'error': 'Artifact not found'}), 404
+    # send_file streams the member and closes it once the response is sent
+    return send_file(
+        stream,
+        mimetype='text/plain',
+        as_attachment=True,
+        download_name=filename,
+    )
+
+def wait_for_archive(run_dir: Path, timeout: float = 60) -> None:
+    """Block until the run's archive, if still being written, is in place"""
+    with PENDING_ARCHIVES_LOCK:
+        future = PENDING_ARCHIVES.get(run_dir.name)
+    if future is not None:
+        # Failures are logged by the job's done-callback
+        wait([future], timeout=timeout)
+        return
+    # Written by another server process: its partial file is renamed when done
+    partial = run_dir / (ARTIFACTS_ARCHIVE + ".part")
+    deadline = time.monotonic() + timeout
+    while partial.exists() and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+@contextmanager
+def run_artifacts(run_dir: Path):
+    """Yield a function that opens a run artifact as a binary stream, or returns None.
+
+    The run's zip is opened once for all artifacts; runs saved before archiving
+    was introduced are read from their loose files.
+    """
+    wait_for_archive(run_dir)
+    try:
+        archive = zipfile.ZipFile(run_dir / ARTIFACTS_ARCHIVE)
+    except FileNotFoundError:
+        archive = None
+
+    def open_artifact(filename: str):
+        if archive is None:
+            try:
+                return open(run_dir / filename, 'rb')
+            except FileNotFoundError:
+                return None
+        try:
+            return archive.open(filename)
+        except KeyError:
+            return None
+
+    try:
+        yield open_artifact
+    finally:
+        # Members opened from the archive stay readable after this
+        if archive is not None:
+            archive.close()
+
+# Run directory and artifact helpers
 def make_run_dir() -> Path:
     RUNS_DIR.mkdir(exist_ok=True)
     stamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-    run_dir = RUNS_DIR / stamp
-    run_dir.mkdir(parents=True, exist_ok=True)
+    # The random suffix keeps concurrent runs in the same second apart;
+    # exist_ok=False makes a collision fail loudly instead of sharing a dir
+    run_dir = RUNS_DIR / f"{stamp}_{uuid.uuid4().hex[:8]}"
+    run_dir.mkdir(parents=True, exist_ok=False)
     return run_dir
 
 def write_file(path: Path, content: str) -> None:
     path.write_text(content, encoding="utf-8")
 
+def write_archive(run_dir: Path, files: dict) -> None:
+    # Written under a partial name and renamed into place, so readers never see
+    # a half-written zip. Level 1 is plenty for '0'/'1' text.
+    partial = run_dir / (ARTIFACTS_ARCHIVE + ".part")
+    with zipfile.ZipFile(partial, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as archive:
+        for name, content in files.items():
+            archive.writestr(name, content)
+    os.replace(partial, run_dir / ARTIFACTS_ARCHIVE)
+
+def archive_done(run_dir: Path, future) -> None:
+    with PENDING_ARCHIVES_LOCK:
+        PENDING_ARCHIVES.pop(run_dir.name, None)
+    exc = future.exception()
+    if exc is not None:
+        app.logger.error("Writing artifacts for run %s failed", run_dir.name, exc_info=exc)
+        (run_dir / (ARTIFACTS_ARCHIVE + ".part")).unlink(missing_ok=True)
+
 def save_part_outputs(run_dir: Path, original_text: str, interval: int, results: dict) -> None:
-    write_file(run_dir / "Text.txt", original_text)
+    files = {"Text.txt": original_text}
     
     probs = results["probabilities"]
     part1_lines = ["# symbol\tprobability"]
     for sym, p in sorted(probs.items(), key=lambda kv: kv[0]):
         part1_lines.append(f"{repr(sym)}\t{p:.10f}")
-    write_file(run_dir / "part1_symbols.txt", "\n".join(part1_lines))
+    files["part1_symbols.txt"] = "\n".join(part1_lines)
     
     codes = results["codes"]
     codes_lines = ["# symbol\tcode"]
     for sym, code in sorted(codes.items(), key=lambda kv: kv[0]):
         codes_lines.append(f"{repr(sym)}\t{code}")
-    write_file(run_dir / "huffman_codes.txt", "\n".join(codes_lines))
+    files["huffman_codes.txt"] = "\n".join(codes_lines)
     
-    write_file(run_dir / "part2_bits.txt", results["encoded_bits"])
-    write_file(run_dir / "part3_decoded.txt", results["decoded_text"])
-    write_file(run_dir / "part4_hamming_bits.txt", results["hamming_bits"])
-    write_file(run_dir / "part4_pad.txt", str(results["pad_bits"]))
-    write_file(run_dir / "part5_corrupted_bits.txt", results["corrupted_bits"])
+    files["part2_bits.txt"] = results["encoded_bits"]
+    files["part3_decoded.txt"] = results["decoded_text"]
+    files["part4_hamming_bits.txt"] = results["hamming_bits"]
+    files["part4_pad.txt"] = str(results["pad_bits"])
+    files["part5_corrupted_bits.txt"] = results["corrupted_bits"]
     
     # Corrupted decode artifacts (no correction)
-    write_file(run_dir / "part5b_corrupted_data_bits.txt", results["corrupted_data_bits"])
-    write_file(run_dir / "part5c_corrupted_decoded_text.txt", results["corrupted_decoded_text"])
-    write_file(run_dir / "part5c_corrupted_decode_ok.txt", str(results["corrupted_decode_ok"]))
+    files["part5b_corrupted_data_bits.txt"] = results["corrupted_data_bits"]
+    files["part5c_corrupted_decoded_text.txt"] = results["corrupted_decoded_text"]
+    files["part5c_corrupted_decode_ok.txt"] = str(results["corrupted_decode_ok"])
     
-    write_file(run_dir / "part6_recovered_bits.txt", results["recovered_bits"])
-    write_file(run_dir / "part6_recovered_decoded_text.txt", results["recovered_decoded_text"])
-    write_file(run_dir / "part6_recovered_text_ok.txt", str(results["recovered_text_ok"]))
+    files["part6_recovered_bits.txt"] = results["recovered_bits"]
+    files["part6_recovered_decoded_text.txt"] = results["recovered_decoded_text"]
+    files["part6_recovered_text_ok.txt"] = str(results["recovered_text_ok"])
     
     summary = {
         "error_interval": interval,
@@ -244,7 +391,14 @@ def save_part_outputs(run_dir: Path, original_text: str, interval: int, results:
         "corrupted_decode_ok": results["corrupted_decode_ok"],
         "recovered_text_ok": results["recovered_text_ok"],
     }
+    # Kept outside the archive so /api/runs can list runs cheaply
     write_file(run_dir / "summary.json", json.dumps(summary, indent=2))
+    # The artifacts are written in the background; the result strings are
+    # cached and never mutated, so the job can hold on to them
+    future = ARCHIVE_EXECUTOR.submit(write_archive, run_dir, files)
+    with PENDING_ARCHIVES_LOCK:
+        PENDING_ARCHIVES[run_dir.name] = future
+    future.add_done_callback(lambda f: archive_done(run_dir, f))
 
 # Serve static files
 @app.route('/<path:filename>')
@@ -253,6 +407,7 @@ def static_files(filename):
     return send_from_directory('.', filename)
 
 if __name__ == "__main__":
+    enable_worker_pool()
     print("Starting Information Theory Project Server...")
     print("Available endpoints:")
     print("  - GET  /                    : Main landing page")
@@ -263,6 +418,10 @@ if __name__ == "__main__":
     print("  - GET  /api/sample-text     : Get sample text content")
     print("  - GET  /api/runs            : List all processing runs")
     print("  - GET  /api/runs/<run_id>   : Get specific run details")
+    print("  - GET  /api/runs/<run_id>/<field> : Download a full run artifact")
     print("\nServer running on http://localhost:5000")
+    print("For production use: gunicorn wsgi:app -c gunicorn_conf.py")
     
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+    # Debug mode adds noticeable per-request overhead; opt in with FLASK_DEBUG=1
+    debug = os.environ.get('FLASK_DEBUG') == '1'
+    app.run(debug=debug, threaded=True, host='0.0.0.0', port=5000)
\ No newline at end of file
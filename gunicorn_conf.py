@@ -0,0 +1,15 @@
+# Gunicorn settings for serving wsgi:app
+# Usage: gunicorn wsgi:app -c gunicorn_conf.py
+import os
+
+bind = os.environ.get("BIND", "0.0.0.0:5000")
+
+# /api/process is CPU-bound Python, so scale with processes; a few threads
+# per worker keep static files and small endpoints responsive meanwhile.
+workers = int(os.environ.get("WEB_CONCURRENCY", min(os.cpu_count() or 1, 4)))
+worker_class = "gthread"
+threads = 4
+keepalive = 30
+
+# Large texts can take a while to run through the full pipeline
+timeout = 120
@@ -0,0 +1,8 @@
+# WSGI entry point for the Flask app under a production server:
+#   gunicorn wsgi:app -c gunicorn_conf.py
+from app_enhanced import app
+from codec import enable_worker_pool
+
+enable_worker_pool()
+
+__all__ = ["app"]